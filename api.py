@@ -1,12 +1,14 @@
-from fastapi import FastAPI
-from fastapi.responses import Response
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from typing import Optional
 from pydantic import BaseModel
 from datetime import date
 from property import PropertyType, Property, PropertyLocation
 from analysis import Timing
 from apartment import ApartmentTenant, RollToMarket, RollToMarketStrategy, ExpenseType, ApartmentIncome, ApartmentExpense
+from jobs import Job, JobManager, JobPriority, JobQueueFull, JobStatus
 from utils import JSONHandler
+import asyncio
 import json
 
 class PropertyLocationModel(BaseModel):
@@ -73,14 +75,13 @@ class ApartmentModel(BaseModel):
     expenses: list[ApartmentExpenseModel]
 
 app = FastAPI()
+job_manager = JobManager()
 
 @app.get("/status")
 async def status():
     return {"status": True, "message": "API Running"}
 
-@app.post("/multi/calculate")
-async def calculate(property_data: ApartmentModel):
-    print(property_data)
+def build_property(property_data: ApartmentModel) -> Property:
     property = Property(
         name=property_data.name,
         property_type=property_data.property_type,
@@ -100,6 +101,7 @@ async def calculate(property_data: ApartmentModel):
             residual_months=property_data.timing.residual_months
         ),
         year_built=property_data.year_built,
+        tenants=[]
     )
     for tenant_data in property_data.tenants:
         tenant = ApartmentTenant(
@@ -144,11 +146,91 @@ async def calculate(property_data: ApartmentModel):
             base_amount=expense_data.base_amount
         )
         property.add_expense(expense)
-    
-    property.rent_roll()
-    property.income_roll()
-    property.expense_roll()
+
+    return property
+
+def submit_job(task, priority: JobPriority, total_steps: int) -> Job:
+    try:
+        return job_manager.submit(task, priority=priority, total_steps=total_steps)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+def get_job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job %s not found" % job_id)
+    return job
+
+@app.post("/multi/calculate")
+async def calculate(property_data: ApartmentModel):
+    print(property_data)
+    property = build_property(property_data)
+    property.calculate()
 
     property_calc_data = json.dumps(property, default=JSONHandler)
 
-    return Response(content=property_calc_data)
\ No newline at end of file
+    return Response(content=property_calc_data)
+
+@app.post("/jobs/multi/calculate")
+async def submit_calculate(property_data: ApartmentModel, priority: JobPriority=JobPriority.INTERACTIVE):
+    def task(job: Job):
+        property = build_property(property_data)
+        property.calculate(report_progress=job.report_progress)
+        return json.dumps(property, default=JSONHandler)
+
+    job = submit_job(task, priority=priority, total_steps=3)
+    return Response(content=json.dumps(job, default=JSONHandler))
+
+@app.post("/jobs/multi/bulk")
+async def submit_bulk(properties_data: list[ApartmentModel]):
+    if not properties_data:
+        raise HTTPException(status_code=422, detail="Bulk calculation needs at least one property")
+
+    def task(job: Job):
+        properties = []
+        for index, property_data in enumerate(properties_data):
+            property = build_property(property_data)
+            property.calculate()
+            properties.append(property)
+            job.report_progress(index + 1)
+        return json.dumps(properties, default=JSONHandler)
+
+    job = submit_job(task, priority=JobPriority.BULK, total_steps=len(properties_data))
+    return Response(content=json.dumps(job, default=JSONHandler))
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = get_job_or_404(job_id)
+    return Response(content=json.dumps(job, default=JSONHandler))
+
+@app.get("/jobs/{job_id}/stream")
+async def job_stream(job_id: str):
+    job = get_job_or_404(job_id)
+
+    async def events():
+        last_state = None
+        while True:
+            state = json.dumps(job, default=JSONHandler)
+            if state != last_state:
+                yield "data: %s\n\n" % state
+                last_state = state
+            if job.is_finished():
+                return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job = get_job_or_404(job_id)
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail="Job %s is %s" % (job_id, job.status.value))
+    return Response(content=job.result)
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job %s not found" % job_id)
+    status_code = 200 if job.is_finished() else 202
+    return Response(content=json.dumps(job, default=JSONHandler), status_code=status_code)
\ No newline at end of file
@@ -0,0 +1,170 @@
+from enum import Enum
+from datetime import datetime
+from collections import OrderedDict
+import heapq
+import itertools
+import threading
+import uuid
+
+class JobStatus(str, Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+
+class JobPriority(int, Enum):
+    INTERACTIVE = 0
+    BULK = 10
+
+class JobCancelled(Exception):
+    pass
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+
+    def __init__(self, task, priority: JobPriority, total_steps: int=1):
+        self.job_id = uuid.uuid4().hex
+        self.priority = priority
+        self.task = task
+
+        # STATUS INFO
+        self.status = JobStatus.QUEUED
+        self.total_steps = total_steps
+        self.steps_completed = 0
+        self.cancel_requested = False
+        self.result = None
+        self.error = None
+
+        # TIMING INFO
+        self.submitted_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def progress(self) -> float:
+        return self.steps_completed / self.total_steps if self.total_steps else 0.0
+
+    def report_progress(self, steps_completed: int):
+        # Called by the task between steps; running jobs are cancelled here.
+        if self.cancel_requested:
+            raise JobCancelled()
+        self.steps_completed = steps_completed
+
+    def json(self):
+        return {
+            "job_id": self.job_id,
+            "priority": self.priority,
+            "status": self.status,
+            "progress": self.progress(),
+            "steps_completed": self.steps_completed,
+            "total_steps": self.total_steps,
+            "cancel_requested": self.cancel_requested,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobManager:
+
+    def __init__(self, workers: int=2, interactive_workers: int=1, max_queued: int=100, max_retained: int=100):
+        self.max_queued = max_queued
+        self.max_retained = max_retained
+
+        self.jobs = {}
+        self.finished = OrderedDict()
+        self.lock = threading.Lock()
+        self.available = threading.Condition(self.lock)
+        self.order = itertools.count()
+
+        # One heap of (priority, order, job_id) entries, one per queued job. Jobs
+        # themselves are only held by self.jobs, so retention bounds their results.
+        self.heap = []
+
+        # General workers take any job by priority; interactive workers only take
+        # interactive jobs so quick calls are not stuck behind bulk work.
+        self.threads = []
+        for _ in range(workers):
+            self.start_worker(interactive_only=False)
+        for _ in range(interactive_workers):
+            self.start_worker(interactive_only=True)
+
+    def start_worker(self, interactive_only: bool):
+        thread = threading.Thread(target=self.work, args=(interactive_only,), daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def submit(self, task, priority: JobPriority=JobPriority.INTERACTIVE, total_steps: int=1) -> Job:
+        # Queued jobs hold their request payload, so the backlog is bounded too.
+        job = Job(task, priority, total_steps)
+        with self.available:
+            if len(self.heap) >= self.max_queued:
+                raise JobQueueFull("Job queue is full (%s queued)" % len(self.heap))
+            self.jobs[job.job_id] = job
+            heapq.heappush(self.heap, (job.priority, next(self.order), job.job_id))
+            self.available.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Job|None:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job|None:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.is_finished():
+                return job
+            if job.status == JobStatus.QUEUED:
+                self.heap = [entry for entry in self.heap if entry[2] != job_id]
+                heapq.heapify(self.heap)
+                self.finish(job, JobStatus.CANCELLED)
+            else:
+                job.cancel_requested = True
+        return job
+
+    def claim(self, interactive_only: bool) -> Job:
+        # The heap is ordered by priority, so interactive jobs are always at the top
+        # when any are queued.
+        with self.available:
+            while not self.heap or (interactive_only and self.heap[0][0] != JobPriority.INTERACTIVE):
+                self.available.wait()
+            _, _, job_id = heapq.heappop(self.heap)
+            job = self.jobs[job_id]
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.now()
+            return job
+
+    def finish(self, job: Job, status: JobStatus):
+        # Caller holds the lock. Finished jobs past max_retained are dropped oldest first.
+        job.status = status
+        job.finished_at = datetime.now()
+        job.task = None
+        self.finished[job.job_id] = job
+        while len(self.finished) > self.max_retained:
+            expired_id, _ = self.finished.popitem(last=False)
+            del self.jobs[expired_id]
+
+    def work(self, interactive_only: bool):
+        while True:
+            job = self.claim(interactive_only)
+            try:
+                result = job.task(job)
+            except JobCancelled:
+                with self.lock:
+                    self.finish(job, JobStatus.CANCELLED)
+            except Exception as e:
+                with self.lock:
+                    job.error = "%s: %s" % (type(e).__name__, e)
+                    self.finish(job, JobStatus.FAILED)
+            else:
+                with self.lock:
+                    job.result = result
+                    job.steps_completed = job.total_steps
+                    self.finish(job, JobStatus.COMPLETED)
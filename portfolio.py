@@ -0,0 +1,187 @@
+from concurrent.futures import ProcessPoolExecutor
+import copy
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from property import Property
+import numpy as np
+
+PORTFOLIO_SERIES = (
+    "effective_gross_income",
+    "opex",
+    "capex",
+    "noi",
+    "cf_from_operations"
+)
+
+def month_offset(calendar_start_date: date, start_date: date) -> int:
+    return (start_date.year - calendar_start_date.year) * 12 + (start_date.month - calendar_start_date.month)
+
+def calculate_property(property: Property) -> Property:
+    property = copy.deepcopy(property)
+    property.calculate()
+    return property
+
+
+class Portfolio:
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int|None=None,
+        parallel_threshold: int=8
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+        self.executor = None
+
+        # MEMBERS
+        self.properties = {}
+        self.calculated = {}
+        self.offsets = {}
+
+        # CALENDAR
+        self.start_date = None
+        self.length_months = 0
+
+        # AGGREGATION STATE
+        self.totals = {}
+        self.applied = {}
+        self.pending = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def add_property(self, name: str, property: Property):
+        if name in self.properties:
+            raise ValueError("Portfolio already has a property named %s" % name)
+        self.properties[name] = property
+        self.pending.add(name)
+
+    def update_property(self, name: str, property: Property):
+        if name not in self.properties:
+            raise ValueError("Portfolio has no property named %s" % name)
+        self.properties[name] = property
+        self.pending.add(name)
+
+    def remove_property(self, name: str):
+        if name not in self.properties:
+            raise ValueError("Portfolio has no property named %s" % name)
+        del self.properties[name]
+        self.calculated.pop(name, None)
+        self.offsets.pop(name, None)
+        self.pending.add(name)
+
+    def calc_calendar(self):
+        if not self.properties:
+            return None, 0
+
+        start_date = min(
+            property.timing.analysis_start_date.replace(day=1)
+            for property in self.properties.values()
+        )
+        length_months = max(
+            month_offset(start_date, property.timing.analysis_start_date) + property.timing.analysis_length_months
+            for property in self.properties.values()
+        )
+        return start_date, length_months
+
+    def calc_properties(self, names: list[str]):
+        # Members are rolled on copies, so the properties passed in are never mutated
+        # and can be edited and passed to update_property again. A single roll takes
+        # milliseconds, so the pool is only used for large batches and is kept open
+        # between calculations until close() is called.
+        properties = [self.properties[name] for name in names]
+        if len(properties) >= self.parallel_threshold and self.max_workers != 1:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            properties = list(self.executor.map(calculate_property, properties))
+        else:
+            properties = [calculate_property(property) for property in properties]
+
+        for name, property in zip(names, properties):
+            self.calculated[name] = property
+        return
+
+    def calc_window(self, start: int, end: int):
+        # Windows are re-summed from the applied members in name order rather than
+        # adjusted in place, so totals always equal the sum of contributions exactly.
+        # Member arrays are added into views of the portfolio calendar, never copied.
+        for series in PORTFOLIO_SERIES:
+            window = self.totals[series][start:end]
+            window.fill(0.0)
+            for name in sorted(self.applied):
+                offset, property = self.applied[name]
+                values = getattr(property, series)
+                overlap_start = max(start, offset)
+                overlap_end = min(end, offset + len(values))
+                if overlap_start < overlap_end:
+                    target = window[overlap_start - start:overlap_end - start]
+                    np.add(target, values[overlap_start - offset:overlap_end - offset], out=target)
+        return
+
+    def calculate(self):
+        self.calc_properties([name for name in self.pending if name in self.properties])
+
+        start_date, length_months = self.calc_calendar()
+        if start_date != self.start_date or length_months != self.length_months:
+            self.start_date = start_date
+            self.length_months = length_months
+            self.totals = {series: np.zeros(length_months) for series in PORTFOLIO_SERIES}
+            self.applied = {}
+            changed = set(self.properties)
+        else:
+            changed = self.pending
+
+        windows = []
+        for name in changed:
+            if name in self.applied:
+                offset, property = self.applied.pop(name)
+                windows.append((offset, offset + property.timing.analysis_length_months))
+            if name in self.properties:
+                property = self.calculated[name]
+                offset = month_offset(self.start_date, property.timing.analysis_start_date)
+                self.applied[name] = (offset, property)
+                self.offsets[name] = offset
+                windows.append((offset, offset + property.timing.analysis_length_months))
+
+        for start, end in windows:
+            self.calc_window(start, end)
+
+        self.pending = set()
+        return
+
+    def calendar(self) -> list[date]:
+        return [self.start_date + relativedelta(months=month) for month in range(self.length_months)]
+
+    def contribution(self, name: str, series: str):
+        if name not in self.applied:
+            raise ValueError("Portfolio has no calculated property named %s" % name)
+        if series not in PORTFOLIO_SERIES:
+            raise ValueError("Portfolio does not aggregate %s" % series)
+        offset, property = self.applied[name]
+        values = getattr(property, series)
+        contribution = np.zeros(self.length_months)
+        contribution[offset:offset + len(values)] = values
+        return contribution
+
+    def contributions(self, series: str):
+        return {name: self.contribution(name, series) for name in sorted(self.applied)}
+
+    def json(self):
+        return {
+            "name": self.name,
+            "start_date": self.start_date,
+            "length_months": self.length_months,
+            "offsets": self.offsets,
+            "totals": self.totals,
+            "contributions": {series: self.contributions(series) for series in PORTFOLIO_SERIES}
+        }
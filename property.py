@@ -157,85 +157,94 @@ class Property:
         self.cf_from_operations = self.noi - self.capex
 
         return
+
+    def calculate(self, report_progress=None):
+        rolls = [self.rent_roll, self.income_roll, self.expense_roll]
+        for step, roll in enumerate(rolls, start=1):
+            roll()
+            if report_progress is not None:
+                report_progress(step)
+        return
     
     def json(self):
         return self.__dict__
 
 
-prop = Property(
-    name="Home",
-    property_type=PropertyType.APARTMENT,
-    location=PropertyLocation("250 W 82nd St", "New York", "NY", "10024"),
-    acres=8.6,
-    gross_buildable_area=100000,
-    vacancy_rate=0.05,
-    year_built="2016",
-    timing=Timing(10, date(2024,1,1), 13)
-)
-
-tenant1 = ApartmentTenant(
-    unit_name="A1",
-    beds=1,
-    bath=1,
-    unit_size=650,
-    total_units=90,
-    units_lease_initial=50,
-    lease_up_pace=15,
-    in_place_rent=1050,
-    roll_to_market=RollToMarket(RollToMarketStrategy.YES, 25),
-    market_rent=2000,
-    rent_growth_matrix={13: 0.03, 25: 0.03, 37: 0.03, 49: 0.03, 61: 0.03, 73: 0.03, 85: 0.03, 97: 0.03, 109: 0.03, 121: 0.03},
-    utility_reimbursement=60,
-    make_ready_new_cost=550,
-    make_ready_renew_cost=150,
-    free_rent_new=1,
-    free_rent_renew=0.5,
-    free_rent_second_generation=False,
-    renew_probability=0.6,
-    downtime=10
-)
-
-rubs = ApartmentIncome(
-    name="Utility Reimbursement",
-    cagr=.02,
-    percent_fixed=0,
-    base_amount=93600,
-)
-parking = ApartmentIncome(
-    name="Parking",
-    cagr=.02,
-    percent_fixed=0,
-    base_amount= 120375
-)
-storage = ApartmentIncome(
-    name="Storage",
-    cagr=.02,
-    percent_fixed=0,
-    base_amount=10098,
-)
-other = ApartmentIncome(
-    name="Other",
-    cagr=.02,
-    percent_fixed=0,
-    base_amount=128454,
-)
-payroll = ApartmentExpense(
-    name="Payroll",
-    type=ExpenseType.OPEX,
-    cagr=.02,
-    percent_fixed=.75,
-    base_amount=70000
-)
-
-
-prop.add_tenant(tenant1)
-prop.rent_roll()
-prop.add_income(rubs)
-prop.add_income(parking)
-prop.add_income(storage)
-prop.add_income(other)
-prop.income_roll()
-prop.add_expense(payroll)
-prop.expense_roll()
-
-print(json.dumps(prop, default=JSONHandler))
+if __name__ == "__main__":
+    prop = Property(
+        name="Home",
+        property_type=PropertyType.APARTMENT,
+        location=PropertyLocation("250 W 82nd St", "New York", "NY", "10024"),
+        acres=8.6,
+        gross_buildable_area=100000,
+        vacancy_rate=0.05,
+        year_built="2016",
+        timing=Timing(10, date(2024,1,1), 13)
+    )
+
+    tenant1 = ApartmentTenant(
+        unit_name="A1",
+        beds=1,
+        bath=1,
+        unit_size=650,
+        total_units=90,
+        units_lease_initial=50,
+        lease_up_pace=15,
+        in_place_rent=1050,
+        roll_to_market=RollToMarket(RollToMarketStrategy.YES, 25),
+        market_rent=2000,
+        rent_growth_matrix={13: 0.03, 25: 0.03, 37: 0.03, 49: 0.03, 61: 0.03, 73: 0.03, 85: 0.03, 97: 0.03, 109: 0.03, 121: 0.03},
+        utility_reimbursement=60,
+        make_ready_new_cost=550,
+        make_ready_renew_cost=150,
+        free_rent_new=1,
+        free_rent_renew=0.5,
+        free_rent_second_generation=False,
+        renew_probability=0.6,
+        downtime=10
+    )
+
+    rubs = ApartmentIncome(
+        name="Utility Reimbursement",
+        cagr=.02,
+        percent_fixed=0,
+        base_amount=93600,
+    )
+    parking = ApartmentIncome(
+        name="Parking",
+        cagr=.02,
+        percent_fixed=0,
+        base_amount= 120375
+    )
+    storage = ApartmentIncome(
+        name="Storage",
+        cagr=.02,
+        percent_fixed=0,
+        base_amount=10098,
+    )
+    other = ApartmentIncome(
+        name="Other",
+        cagr=.02,
+        percent_fixed=0,
+        base_amount=128454,
+    )
+    payroll = ApartmentExpense(
+        name="Payroll",
+        type=ExpenseType.OPEX,
+        cagr=.02,
+        percent_fixed=.75,
+        base_amount=70000
+    )
+
+
+    prop.add_tenant(tenant1)
+    prop.rent_roll()
+    prop.add_income(rubs)
+    prop.add_income(parking)
+    prop.add_income(storage)
+    prop.add_income(other)
+    prop.income_roll()
+    prop.add_expense(payroll)
+    prop.expense_roll()
+
+    print(json.dumps(prop, default=JSONHandler))
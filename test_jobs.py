@@ -0,0 +1,140 @@
+from fastapi.testclient import TestClient
+from jobs import JobManager, JobPriority, JobQueueFull, JobStatus
+import gc
+import threading
+import time
+import weakref
+import api
+import pytest
+
+PROPERTY_DATA = {
+    "name": "Home",
+    "property_type": "Apartment",
+    "location": {"address": "250 W 82nd St", "city": "New York", "state": "NY", "zipcode": "10024"},
+    "acres": 8.6,
+    "gross_buildable_area": 100000,
+    "vacancy_rate": 0.05,
+    "timing": {"analysis_length_years": 10, "analysis_start_date": "2024-01-01", "growth_begin_month": 13},
+    "year_built": "2016",
+    "tenants": [],
+    "incomes": [],
+    "expenses": []
+}
+
+def wait_for(condition, timeout: float=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for job"
+        time.sleep(0.01)
+
+def blocking_task(release: threading.Event):
+    def task(job):
+        while not release.wait(0.01):
+            job.report_progress(0)
+        return "bulk"
+    return task
+
+
+def test_interactive_job_completes_while_bulk_runs():
+    release = threading.Event()
+    manager = JobManager(workers=1, interactive_workers=1)
+    bulk = manager.submit(blocking_task(release), priority=JobPriority.BULK)
+    queued_bulk = manager.submit(blocking_task(release), priority=JobPriority.BULK)
+    wait_for(lambda: bulk.status == JobStatus.RUNNING)
+
+    interactive = manager.submit(lambda job: "interactive")
+    wait_for(interactive.is_finished)
+
+    assert interactive.status == JobStatus.COMPLETED
+    assert interactive.result == "interactive"
+    assert bulk.status == JobStatus.RUNNING
+    assert queued_bulk.status == JobStatus.QUEUED
+
+    release.set()
+    wait_for(queued_bulk.is_finished)
+    assert queued_bulk.status == JobStatus.COMPLETED
+
+def test_finished_interactive_results_are_bounded_by_retention():
+    release = threading.Event()
+    manager = JobManager(workers=1, interactive_workers=1, max_queued=5, max_retained=5)
+    bulk = manager.submit(blocking_task(release), priority=JobPriority.BULK)
+    wait_for(lambda: bulk.status == JobStatus.RUNNING)
+
+    jobs = []
+    for _ in range(50):
+        job = manager.submit(lambda job: "x" * 100000)
+        jobs.append(weakref.ref(job))
+        wait_for(job.is_finished)
+        del job
+
+    gc.collect()
+    assert len([job for job in jobs if job() is not None]) <= 5
+    assert manager.heap == []
+    release.set()
+
+def test_cancel_queued_job():
+    manager = JobManager(workers=0, interactive_workers=0)
+    job = manager.submit(lambda job: "never")
+
+    assert manager.cancel(job.job_id) is job
+    assert job.status == JobStatus.CANCELLED
+    assert manager.heap == []
+
+def test_cancel_running_job():
+    release = threading.Event()
+    manager = JobManager(workers=1, interactive_workers=0)
+    job = manager.submit(blocking_task(release), priority=JobPriority.BULK)
+    wait_for(lambda: job.status == JobStatus.RUNNING)
+
+    manager.cancel(job.job_id)
+    assert job.json()["cancel_requested"]
+
+    wait_for(job.is_finished)
+    assert job.status == JobStatus.CANCELLED
+    assert job.result is None
+
+def test_max_queued_rejects_submissions():
+    manager = JobManager(workers=0, interactive_workers=0, max_queued=2)
+    first = manager.submit(lambda job: 1)
+    manager.submit(lambda job: 2)
+
+    with pytest.raises(JobQueueFull):
+        manager.submit(lambda job: 3)
+
+    manager.cancel(first.job_id)
+    manager.submit(lambda job: 3)
+
+def test_max_retained_evicts_oldest_finished_jobs():
+    manager = JobManager(workers=1, interactive_workers=0, max_retained=2)
+    jobs = [manager.submit(lambda job: "done") for _ in range(4)]
+    wait_for(lambda: all(job.is_finished() for job in jobs))
+
+    assert [manager.get(job.job_id) for job in jobs] == [None, None, jobs[2], jobs[3]]
+
+
+def test_api_rejects_submissions_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(api, "job_manager", JobManager(workers=0, interactive_workers=0, max_queued=0))
+    client = TestClient(api.app)
+
+    response = client.post("/jobs/multi/bulk", json=[])
+    assert response.status_code == 422
+
+    response = client.post("/jobs/multi/bulk", json=[PROPERTY_DATA])
+    assert response.status_code == 429
+
+def test_api_cancel_running_job_returns_accepted(monkeypatch):
+    release = threading.Event()
+    manager = JobManager(workers=1, interactive_workers=0)
+    monkeypatch.setattr(api, "job_manager", manager)
+    client = TestClient(api.app)
+    job = manager.submit(blocking_task(release), priority=JobPriority.BULK)
+    wait_for(lambda: job.status == JobStatus.RUNNING)
+
+    response = client.delete("/jobs/%s" % job.job_id)
+    assert response.status_code == 202
+    assert response.json()["cancel_requested"]
+
+    wait_for(job.is_finished)
+    response = client.delete("/jobs/%s" % job.job_id)
+    assert response.status_code == 200
+    assert response.json()["status"] == JobStatus.CANCELLED.value
@@ -0,0 +1,125 @@
+from datetime import date
+from analysis import Timing
+from apartment import ApartmentTenant, RollToMarket, RollToMarketStrategy, ApartmentIncome, ApartmentExpense, ExpenseType
+from property import Property, PropertyType, PropertyLocation
+from portfolio import Portfolio
+import numpy as np
+import pytest
+
+def make_property(analysis_start_date: date, analysis_length_years: int, vacancy_rate: float=0.05) -> Property:
+    property = Property(
+        name="Home",
+        property_type=PropertyType.APARTMENT,
+        location=PropertyLocation("250 W 82nd St", "New York", "NY", "10024"),
+        acres=8.6,
+        gross_buildable_area=100000,
+        vacancy_rate=vacancy_rate,
+        year_built="2016",
+        timing=Timing(analysis_length_years, analysis_start_date, 13),
+        tenants=[]
+    )
+    property.add_tenant(ApartmentTenant(
+        unit_name="A1",
+        beds=1,
+        bath=1,
+        unit_size=650,
+        total_units=90,
+        units_lease_initial=50,
+        lease_up_pace=15,
+        in_place_rent=1050,
+        roll_to_market=RollToMarket(RollToMarketStrategy.YES, 25),
+        market_rent=2000,
+        rent_growth_matrix={month: 0.03 for month in range(13, 12 * analysis_length_years + 2, 12)},
+        utility_reimbursement=60,
+        make_ready_new_cost=550,
+        make_ready_renew_cost=150,
+        free_rent_new=1,
+        free_rent_renew=0.5,
+        free_rent_second_generation=False,
+        renew_probability=0.6,
+        downtime=10
+    ))
+    property.add_income(ApartmentIncome(name="Parking", cagr=.02, percent_fixed=0, base_amount=120375))
+    property.add_expense(ApartmentExpense(name="Payroll", type=ExpenseType.OPEX, cagr=.02, percent_fixed=.75, base_amount=70000))
+    return property
+
+def assert_totals_match_contributions(portfolio: Portfolio):
+    for series, total in portfolio.totals.items():
+        assert np.array_equal(sum(portfolio.contributions(series).values()), total)
+
+
+def test_members_are_placed_by_month_offset():
+    portfolio = Portfolio("Fund")
+    portfolio.add_property("a", make_property(date(2024, 1, 1), 10))
+    portfolio.add_property("b", make_property(date(2025, 3, 15), 5))
+    portfolio.calculate()
+
+    assert portfolio.start_date == date(2024, 1, 1)
+    assert portfolio.length_months == 120
+    assert portfolio.offsets == {"a": 0, "b": 14}
+
+    noi = portfolio.contribution("b", "noi")
+    assert not noi[:14].any()
+    assert not noi[74:].any()
+    assert np.array_equal(noi[14:74], portfolio.calculated["b"].noi)
+    assert_totals_match_contributions(portfolio)
+
+def test_removing_earliest_member_rebuilds_calendar():
+    portfolio = Portfolio("Fund")
+    portfolio.add_property("a", make_property(date(2024, 1, 1), 10))
+    portfolio.add_property("b", make_property(date(2025, 3, 1), 5))
+    portfolio.calculate()
+
+    portfolio.remove_property("a")
+    portfolio.calculate()
+
+    assert portfolio.start_date == date(2025, 3, 1)
+    assert portfolio.length_months == 60
+    assert portfolio.offsets == {"b": 0}
+    assert np.array_equal(portfolio.totals["noi"], portfolio.calculated["b"].noi)
+
+def test_incremental_updates_keep_totals_exact():
+    portfolio = Portfolio("Fund")
+    portfolio.add_property("a", make_property(date(2024, 1, 1), 10))
+    portfolio.add_property("b", make_property(date(2024, 6, 1), 5))
+    portfolio.calculate()
+
+    for step in range(20):
+        portfolio.update_property("b", make_property(date(2024, 6, 1), 5, vacancy_rate=0.01 * step))
+        portfolio.calculate()
+        assert_totals_match_contributions(portfolio)
+
+    portfolio.remove_property("b")
+    portfolio.calculate()
+    assert np.array_equal(portfolio.totals["noi"], portfolio.contribution("a", "noi"))
+
+@pytest.mark.parametrize("parallel_threshold", [2, 8])
+def test_input_properties_are_not_mutated(parallel_threshold):
+    a = make_property(date(2024, 1, 1), 10)
+    b = make_property(date(2025, 1, 1), 5)
+    with Portfolio("Fund", parallel_threshold=parallel_threshold) as portfolio:
+        portfolio.add_property("a", a)
+        portfolio.add_property("b", b)
+        portfolio.calculate()
+
+        assert isinstance(a.opex, list) and isinstance(b.opex, list)
+        assert a.rental_revenues == [] and b.rental_revenues == []
+
+        b.vacancy_rate = 0.5
+        noi = portfolio.totals["noi"].sum()
+        portfolio.update_property("b", b)
+        portfolio.calculate()
+        assert portfolio.totals["noi"].sum() < noi
+
+    other = Portfolio("Other")
+    other.add_property("a", a)
+    other.calculate()
+    assert np.array_equal(other.totals["noi"], portfolio.contribution("a", "noi"))
+
+def test_contribution_rejects_unknown_series():
+    portfolio = Portfolio("Fund")
+    portfolio.add_property("a", make_property(date(2024, 1, 1), 10))
+    portfolio.calculate()
+
+    with pytest.raises(ValueError):
+        portfolio.contribution("a", "name")